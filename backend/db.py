@@ -5,11 +5,38 @@ Commit after every write for crash recovery.
 """
 
 import json
+import re
 import uuid
 from datetime import datetime, timezone
 from typing import Optional
 
 import aiosqlite
+import orjson
+
+
+# JSON columns (and the agent's phase checkpoints) are encoded on every write
+# and decoded on every read, so these go through orjson. orjson cannot encode
+# ints outside the 64-bit range and decodes them as floats, so such values
+# take the stdlib path both ways: any out-of-range int has 19+ digits.
+_LONG_DIGITS_RE = re.compile(r"\d{19}")
+
+
+def json_dumps(value) -> str:
+    try:
+        return orjson.dumps(value).decode()
+    except TypeError:
+        return json.dumps(value)
+
+
+def json_loads(raw: str):
+    if _LONG_DIGITS_RE.search(raw):
+        return json.loads(raw)
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Rows the stdlib wrote that orjson refuses (NaN, lone surrogates)
+        return json.loads(raw)
+
 
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS engagements (
@@ -113,6 +140,11 @@ CREATE TABLE IF NOT EXISTS firm_feedback (
     reworded_description TEXT DEFAULT '',
     created_at TEXT NOT NULL
 );
+
+-- Per-engagement reads filter on engagement_id and order by created_at
+CREATE INDEX IF NOT EXISTS idx_tool_results_engagement ON tool_results(engagement_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_findings_engagement ON findings(engagement_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_chat_history_engagement ON chat_history(engagement_id, created_at);
 """
 
 
@@ -124,6 +156,9 @@ class Database:
     def __init__(self, db_path: str = "/opt/pentest/data/ptbudgetbuster.db"):
         self.db_path = db_path
         self._db: Optional[aiosqlite.Connection] = None
+        # Raw JSON text per config key (None = known missing). This process is
+        # the only writer, so set_config keeps it authoritative.
+        self._config_cache: dict[str, Optional[str]] = {}
 
     async def initialize(self):
         self._db = await aiosqlite.connect(self.db_path)
@@ -175,8 +210,8 @@ class Database:
             """INSERT INTO engagements
                (id, name, target_scope, notes, status, scheduled_at, tool_api_keys, created_by, created_at, updated_at)
                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (eid, name, json.dumps(target_scope), notes, status,
-             scheduled_at, json.dumps(tool_api_keys or {}), created_by, now, now),
+            (eid, name, json_dumps(target_scope), notes, status,
+             scheduled_at, json_dumps(tool_api_keys or {}), created_by, now, now),
         )
         await self._db.commit()
         return await self.get_engagement(eid)
@@ -190,6 +225,12 @@ class Database:
                 return None
             return self._row_to_engagement(row)
 
+    async def engagement_exists(self, eid: str) -> bool:
+        async with self._db.execute(
+            "SELECT 1 FROM engagements WHERE id = ?", (eid,)
+        ) as cursor:
+            return await cursor.fetchone() is not None
+
     async def list_engagements(self) -> list[dict]:
         async with self._db.execute(
             "SELECT * FROM engagements ORDER BY created_at DESC"
@@ -204,7 +245,7 @@ class Database:
             if key in kwargs:
                 val = kwargs[key]
                 if key in ("target_scope", "tool_api_keys"):
-                    val = json.dumps(val)
+                    val = json_dumps(val)
                 sets.append(f"{key} = ?")
                 vals.append(val)
         if not sets:
@@ -226,12 +267,12 @@ class Database:
         return {
             "id": row["id"],
             "name": row["name"],
-            "target_scope": json.loads(row["target_scope"]),
+            "target_scope": json_loads(row["target_scope"]),
             "notes": row["notes"],
             "status": row["status"],
             "current_phase": row["current_phase"],
             "scheduled_at": row["scheduled_at"],
-            "tool_api_keys": json.loads(row["tool_api_keys"]),
+            "tool_api_keys": json_loads(row["tool_api_keys"]),
             "created_by": row["created_by"] if "created_by" in row.keys() else "",
             "created_at": row["created_at"],
             "updated_at": row["updated_at"],
@@ -246,7 +287,7 @@ class Database:
                VALUES (?, ?, ?, ?)
                ON CONFLICT(engagement_id, phase)
                DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at""",
-            (engagement_id, phase, json.dumps(state), now),
+            (engagement_id, phase, json_dumps(state), now),
         )
         await self._db.commit()
 
@@ -256,7 +297,7 @@ class Database:
             (engagement_id, phase),
         ) as cursor:
             row = await cursor.fetchone()
-            return json.loads(row["state"]) if row else None
+            return json_loads(row["state"]) if row else None
 
     # -- Tool Lessons -----------------------------------------------
 
@@ -298,7 +339,7 @@ class Database:
         cursor = await self._db.execute(
             """INSERT INTO tool_results (engagement_id, phase, tool, input, output, status, created_at)
                VALUES (?, ?, ?, ?, '', 'running', ?)""",
-            (engagement_id, phase, tool, json.dumps(input), now),
+            (engagement_id, phase, tool, json_dumps(input), now),
         )
         await self._db.commit()
         return cursor.lastrowid
@@ -322,7 +363,7 @@ class Database:
             """INSERT INTO tool_results (engagement_id, phase, tool, input, output, status, created_at)
                VALUES (?, ?, ?, ?, ?, ?, ?)""",
             (engagement_id, result["phase"], result["tool"],
-             json.dumps(result.get("input", {})), result.get("output", ""),
+             json_dumps(result.get("input", {})), result.get("output", ""),
              result.get("status", "unknown"), now),
         )
         await self._db.commit()
@@ -338,7 +379,7 @@ class Database:
             rows = await cursor.fetchall()
             return [{
                 "id": r["id"], "phase": r["phase"], "tool": r["tool"],
-                "input": json.loads(r["input"]), "output": r["output"],
+                "input": json_loads(r["input"]), "output": r["output"],
                 "status": r["status"], "created_at": r["created_at"],
                 "error": r["error"] if r["error"] is not None else "",
                 "exit_code": r["exit_code"],
@@ -378,6 +419,14 @@ class Database:
                 "created_at": r["created_at"],
             } for r in rows]
 
+    async def get_finding_counts(self) -> dict[str, int]:
+        """Return {engagement_id: finding_count} for all engagements in one query."""
+        async with self._db.execute(
+            "SELECT engagement_id, COUNT(*) as count FROM findings GROUP BY engagement_id"
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return {r["engagement_id"]: r["count"] for r in rows}
+
     async def update_finding(self, finding_id: str, **kwargs):
         sets, vals = [], []
         if "exploitation_approved" in kwargs:
@@ -449,15 +498,27 @@ class Database:
                 "must_change_password": bool(row["must_change_password"]),
             }
 
-    async def list_users(self) -> list[dict]:
-        async with self._db.execute("SELECT * FROM users ORDER BY username") as cursor:
+    async def list_users(
+        self, offset: int = 0, limit: Optional[int] = None, include_hash: bool = False,
+    ) -> list[dict]:
+        # LIMIT -1 means no limit in SQLite
+        async with self._db.execute(
+            "SELECT * FROM users ORDER BY username LIMIT ? OFFSET ?",
+            (limit if limit is not None else -1, offset),
+        ) as cursor:
             rows = await cursor.fetchall()
-            return [{
-                "username": r["username"], "role": r["role"],
-                "display_name": r["display_name"], "email": r["email"],
-                "enabled": bool(r["enabled"]),
-                "must_change_password": bool(r["must_change_password"]),
-            } for r in rows]
+            users = []
+            for r in rows:
+                user = {
+                    "username": r["username"], "role": r["role"],
+                    "display_name": r["display_name"], "email": r["email"],
+                    "enabled": bool(r["enabled"]),
+                    "must_change_password": bool(r["must_change_password"]),
+                }
+                if include_hash:
+                    user["password_hash"] = r["password_hash"]
+                users.append(user)
+            return users
 
     async def delete_user(self, username: str):
         await self._db.execute("DELETE FROM users WHERE username = ?", (username,))
@@ -466,16 +527,48 @@ class Database:
     # -- Config ----------------------------------------------------
 
     async def get_config(self, key: str) -> Optional[str]:
-        async with self._db.execute("SELECT value FROM config WHERE key = ?", (key,)) as cursor:
-            row = await cursor.fetchone()
-            return json.loads(row["value"]) if row else None
+        if key not in self._config_cache:
+            async with self._db.execute("SELECT value FROM config WHERE key = ?", (key,)) as cursor:
+                row = await cursor.fetchone()
+                self._config_cache[key] = row["value"] if row else None
+        raw = self._config_cache[key]
+        return json_loads(raw) if raw is not None else None
+
+    async def get_configs(self, keys: list[str]) -> dict:
+        """Return {key: value} for the given keys in one query; missing keys are omitted."""
+        missing = [k for k in keys if k not in self._config_cache]
+        if missing:
+            placeholders = ",".join("?" * len(missing))
+            async with self._db.execute(
+                f"SELECT key, value FROM config WHERE key IN ({placeholders})", tuple(missing)
+            ) as cursor:
+                found = {r["key"]: r["value"] for r in await cursor.fetchall()}
+            for k in missing:
+                self._config_cache[k] = found.get(k)
+        return {
+            k: json_loads(raw)
+            for k in keys
+            if (raw := self._config_cache[k]) is not None
+        }
 
     async def set_config(self, key: str, value):
+        raw = json_dumps(value)
         await self._db.execute(
             "INSERT INTO config (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
-            (key, json.dumps(value)),
+            (key, raw),
+        )
+        await self._db.commit()
+        self._config_cache[key] = raw
+
+    async def set_configs(self, values: dict):
+        """Upsert several config keys in one transaction (single commit)."""
+        raws = {key: json_dumps(value) for key, value in values.items()}
+        await self._db.executemany(
+            "INSERT INTO config (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            list(raws.items()),
         )
         await self._db.commit()
+        self._config_cache.update(raws)
 
     # -- Firm Knowledge -----------------------------------------------
 
@@ -11,16 +11,17 @@ Trimmed endpoint set (~25 endpoints), backed by:
 import asyncio
 import json
 import re
+import time
 from contextlib import asynccontextmanager
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Optional
 
 import httpx
+import orjson
 from fastapi import (
     FastAPI,
     HTTPException,
     WebSocket,
-    WebSocketDisconnect,
     Depends,
     Request,
     Query,
@@ -28,11 +29,12 @@ from fastapi import (
     File,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings
-from jose import jwt, JWTError
+import jwt
+from jwt import InvalidTokenError as JWTError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 import io as _io
@@ -41,6 +43,7 @@ from docx import Document as DocxDocument
 
 from db import Database
 from agent import PentestAgent
+from bedrock_client import BedrockClient
 from user_manager import UserManager
 from firm_knowledge import validate_csv, build_knowledge_block
 
@@ -84,6 +87,19 @@ async def lifespan(app: FastAPI):
     await user_mgr.ensure_admin()
     # Store on app state so it's accessible from dependency injection
     app.state.user_mgr = user_mgr
+    # One Bedrock client shared by all agents (boto3 clients are thread-safe)
+    app.state.bedrock = BedrockClient(
+        region=settings.aws_region, model_id=settings.bedrock_model_id,
+    )
+    # Pooled toolbox client reused by every request (keep-alive instead of a
+    # fresh connection per call)
+    app.state.toolbox = httpx.AsyncClient(
+        base_url=toolbox_url,
+        timeout=600.0,
+        # Every running agent holds a connection for the length of a tool run;
+        # keep enough of them alive that concurrent engagements don't reconnect
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    )
     # Mark any orphaned "running" engagements as stopped (e.g. after server restart)
     for eng in await db.list_engagements():
         if eng["status"] == "running":
@@ -100,15 +116,21 @@ async def lifespan(app: FastAPI):
     # Stop any running agents
     for agent in active_agents.values():
         agent.stop()
+    await app.state.toolbox.aclose()
     await db.close()
 
 
-app = FastAPI(title="AutoXPT Backend", version="2.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="AutoXPT Backend",
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
-origins = [o.strip() for o in settings.allowed_origins.split(",")]
+origins = [o.strip() for o in settings.allowed_origins.split(",") if o.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins + ["*"],
+    allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -125,13 +147,35 @@ def _get_user_mgr() -> UserManager:
     return app.state.user_mgr
 
 
-def get_toolbox_client():
-    return httpx.AsyncClient(base_url=toolbox_url, timeout=600.0)
+def _make_agent(engagement_id: str) -> PentestAgent:
+    return PentestAgent(
+        db=db,
+        engagement_id=engagement_id,
+        toolbox_url=toolbox_url,
+        broadcast_fn=lambda evt, eid=engagement_id: broadcast(eid, evt),
+        region=settings.aws_region,
+        model_id=settings.bedrock_model_id,
+        bedrock=app.state.bedrock,
+        toolbox=app.state.toolbox,
+    )
+
+
+def _get_toolbox() -> httpx.AsyncClient:
+    return app.state.toolbox
+
+
+async def _require_engagement(engagement_id: str) -> None:
+    """404 unless the engagement exists, without loading the full row."""
+    if not await db.engagement_exists(engagement_id):
+        raise HTTPException(404, "Engagement not found")
+
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]")
 
 
 def strip_ansi(text):
     """Remove ANSI escape codes from text."""
-    return re.sub(r"\x1b\[[0-9;]*[a-zA-Z]", "", str(text))
+    return _ANSI_RE.sub("", str(text))
 
 
 # ──────────────────────────────────────────────
@@ -142,7 +186,7 @@ security = HTTPBearer(auto_error=False)
 
 
 def create_token(username: str, role: str) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(hours=settings.jwt_expire_hours)
+    expire = int(time.time()) + settings.jwt_expire_hours * 3600
     return jwt.encode(
         {"sub": username, "role": role, "exp": expire},
         settings.jwt_secret,
@@ -150,12 +194,36 @@ def create_token(username: str, role: str) -> str:
     )
 
 
+# Decoded-payload cache keyed by raw token: the password-change middleware and
+# the auth dependency both decode the same token on every request
+_token_cache: dict[str, dict] = {}
+_TOKEN_CACHE_MAX = 4096
+
+
+def _decode_token(token: str) -> dict:
+    """Decode and verify a JWT, reusing the cached payload until it expires."""
+    payload = _token_cache.get(token)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        del _token_cache[token]
+    # Require the claims we rely on so a token without exp is never cached forever
+    payload = jwt.decode(
+        token, settings.jwt_secret, algorithms=["HS256"],
+        options={"require": ["exp", "sub"]},
+    )
+    if len(_token_cache) >= _TOKEN_CACHE_MAX:
+        _token_cache.clear()
+    _token_cache[token] = payload
+    return payload
+
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Extract and validate JWT token, return user."""
     if not credentials:
         raise HTTPException(401, "Not authenticated")
     try:
-        payload = jwt.decode(credentials.credentials, settings.jwt_secret, algorithms=["HS256"])
+        payload = _decode_token(credentials.credentials)
         username = payload.get("sub")
         if not username:
             raise HTTPException(401, "Invalid token")
@@ -195,7 +263,7 @@ async def check_password_change_required(request: Request, call_next):
     if auth_header.startswith("Bearer "):
         token_str = auth_header[7:]
         try:
-            payload = jwt.decode(token_str, settings.jwt_secret, algorithms=["HS256"])
+            payload = _decode_token(token_str)
             username = payload.get("sub")
             if username:
                 user_mgr = _get_user_mgr()
@@ -215,21 +283,31 @@ async def check_password_change_required(request: Request, call_next):
 #  WebSocket presence + broadcast
 # ──────────────────────────────────────────────
 
-# {engagement_id: [{ws, username, joined_at}]}
-ws_presence: dict[str, list[dict]] = {}
+# {engagement_id: {id(ws): {ws, username, joined_at}}}
+ws_presence: dict[str, dict[int, dict]] = {}
 
 
 async def broadcast(engagement_id: str, event: dict):
     """Send event to all WebSocket clients for an engagement."""
-    if engagement_id in ws_presence:
-        dead = []
-        for entry in ws_presence[engagement_id]:
-            try:
-                await entry["ws"].send_json(event)
-            except Exception:
-                dead.append(entry)
-        for entry in dead:
-            ws_presence[engagement_id].remove(entry)
+    # Snapshot so joins/leaves during the sends don't mutate what we iterate
+    entries = list(ws_presence.get(engagement_id, {}).values())
+    if not entries:
+        return
+    # Serialize once for the whole fan-out rather than once per client
+    try:
+        payload = orjson.dumps(event, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        # Events carry model/toolbox data orjson may not encode; a bad
+        # payload must not abort the caller's tool call
+        payload = json.dumps(event, default=str)
+    results = await asyncio.gather(
+        *(entry["ws"].send_text(payload) for entry in entries),
+        return_exceptions=True,
+    )
+    conns = ws_presence.get(engagement_id, {})
+    for entry, result in zip(entries, results):
+        if isinstance(result, Exception):
+            conns.pop(id(entry["ws"]), None)
 
 
 async def broadcast_presence(engagement_id: str):
@@ -238,7 +316,7 @@ async def broadcast_presence(engagement_id: str):
     if engagement_id in ws_presence:
         users = [
             {"username": e["username"], "joined_at": e["joined_at"]}
-            for e in ws_presence[engagement_id]
+            for e in ws_presence[engagement_id].values()
         ]
     await broadcast(engagement_id, {
         "type": "presence_update",
@@ -322,7 +400,7 @@ async def get_me(user=Depends(get_current_user)):
 
 @app.post("/api/auth/change-password")
 async def change_password(req: ChangePasswordRequest, user=Depends(get_current_user)):
-    if not user.verify_password(req.current_password):
+    if not await asyncio.to_thread(user.verify_password, req.current_password):
         raise HTTPException(400, "Current password is incorrect")
     user_mgr = _get_user_mgr()
     try:
@@ -350,9 +428,8 @@ async def create_engagement(req: CreateEngagementRequest, user=Depends(get_curre
     if req.scheduled_at:
         try:
             from apscheduler.triggers.date import DateTrigger
-            run_dt = datetime.fromisoformat(req.scheduled_at)
-            if run_dt.tzinfo is None:
-                run_dt = run_dt.replace(tzinfo=timezone.utc)
+            from scheduler import parse_scheduled_at
+            run_dt = parse_scheduled_at(req.scheduled_at)
             scheduler.add_job(
                 _start_engagement,
                 trigger=DateTrigger(run_date=run_dt),
@@ -369,10 +446,10 @@ async def create_engagement(req: CreateEngagementRequest, user=Depends(get_curre
 @app.get("/api/engagements")
 async def list_engagements(user=Depends(get_current_user)):
     engagements = await db.list_engagements()
-    # Enrich with finding count
+    # Enrich with finding count (one grouped query, not one per engagement)
+    counts = await db.get_finding_counts()
     for eng in engagements:
-        findings = await db.get_findings(eng["id"])
-        eng["finding_count"] = len(findings)
+        eng["finding_count"] = counts.get(eng["id"], 0)
     return engagements
 
 
@@ -393,14 +470,22 @@ async def delete_engagement(engagement_id: str, user=Depends(get_current_user)):
     if not engagement:
         raise HTTPException(404, "Engagement not found")
     # Stop agent if running
-    if engagement_id in active_agents:
-        active_agents[engagement_id].stop()
-        del active_agents[engagement_id]
-    # Remove scheduler job if exists
+    agent = active_agents.pop(engagement_id, None)
+    if agent:
+        agent.stop()
+    # Cancel the background task too, so it doesn't keep writing rows for a
+    # deleted engagement until its current tool call returns
+    task = _agent_tasks.pop(engagement_id, None)
+    if task and not task.done():
+        task.cancel()
+    # Remove scheduler jobs if they exist: the one registered at creation and
+    # the one re-registered by restore_schedules on startup
     try:
         scheduler.remove_job(f"engagement-{engagement_id}")
     except Exception:
         pass
+    from scheduler import cancel_schedule
+    cancel_schedule(engagement_id)
     await db.delete_engagement(engagement_id)
     return {"status": "deleted"}
 
@@ -416,14 +501,7 @@ async def _start_engagement(engagement_id: str):
         print(f"[WARN] Engagement {engagement_id} already has a running agent")
         return
 
-    agent = PentestAgent(
-        db=db,
-        engagement_id=engagement_id,
-        toolbox_url=toolbox_url,
-        broadcast_fn=lambda evt, eid=engagement_id: broadcast(eid, evt),
-        region=settings.aws_region,
-        model_id=settings.bedrock_model_id,
-    )
+    agent = _make_agent(engagement_id)
     active_agents[engagement_id] = agent
 
     async def _run_and_cleanup():
@@ -461,9 +539,7 @@ async def start_engagement(engagement_id: str, user=Depends(get_current_user)):
 
 @app.post("/api/engagements/{engagement_id}/stop")
 async def stop_engagement(engagement_id: str, user=Depends(get_current_user)):
-    engagement = await db.get_engagement(engagement_id)
-    if not engagement:
-        raise HTTPException(404, "Engagement not found")
+    await _require_engagement(engagement_id)
     # Set flag on agent if in memory
     agent = active_agents.pop(engagement_id, None)
     if agent:
@@ -518,17 +594,7 @@ async def approve_exploitation(
         )
         if not exploitable:
             raise HTTPException(409, "Engagement is not awaiting exploitation approval")
-        from agent import PentestAgent
-        from bedrock_client import BedrockClient
-        agent = PentestAgent(
-            engagement_id=engagement_id,
-            db=db,
-            broadcast=lambda msg: broadcast(engagement_id, msg),
-            bedrock=BedrockClient(
-                region=settings.aws_region,
-                model_id=settings.bedrock_model_id,
-            ),
-        )
+        agent = _make_agent(engagement_id)
         active_agents[engagement_id] = agent
 
     # Mark approved findings in database
@@ -559,9 +625,7 @@ async def approve_exploitation(
 
 @app.get("/api/engagements/{engagement_id}/findings")
 async def list_findings(engagement_id: str, user=Depends(get_current_user)):
-    engagement = await db.get_engagement(engagement_id)
-    if not engagement:
-        raise HTTPException(404, "Engagement not found")
+    await _require_engagement(engagement_id)
     return await db.get_findings(engagement_id)
 
 
@@ -572,57 +636,44 @@ async def list_events(engagement_id: str, user=Depends(get_current_user)):
     Emits a synthetic phase_changed event each time the phase transitions,
     plus a tool_start + tool_result pair per row so the log is readable.
     """
-    engagement = await db.get_engagement(engagement_id)
-    if not engagement:
-        raise HTTPException(404, "Engagement not found")
+    await _require_engagement(engagement_id)
     rows = await db.get_tool_results(engagement_id)
     events = []
     current_phase = None
     for r in rows:
+        phase, tool, ts = r["phase"], r["tool"], r["created_at"]
         # Inject phase change marker when phase transitions
-        if r["phase"] != current_phase:
-            current_phase = r["phase"]
+        if phase != current_phase:
+            current_phase = phase
             events.append({
                 "type": "phase_changed",
-                "phase": r["phase"],
+                "phase": phase,
                 "objective": "",
-                "timestamp": r["created_at"],
+                "timestamp": ts,
             })
-        inp = r["input"] or {}
+        # Every row shows what was called; rows still running stop there
+        events.append({
+            "type": "tool_start",
+            "tool": tool,
+            "parameters": r["input"] or {},
+            "timestamp": ts,
+        })
         output = r["output"] or ""
-        if r["status"] == "running":
-            # Tool started but hasn't finished — show as in-progress
-            events.append({
-                "type": "tool_start",
-                "tool": r["tool"],
-                "parameters": inp,
-                "timestamp": r["created_at"],
-            })
-        else:
-            # Completed — show what was called and the result (if any output)
+        if r["status"] != "running" and output.strip():
             events.append({
-                "type": "tool_start",
-                "tool": r["tool"],
-                "parameters": inp,
-                "timestamp": r["created_at"],
+                "type": "tool_result",
+                "tool": tool,
+                "result": {"output": output, "status": r["status"]},
+                "phase": phase,
+                "timestamp": ts,
             })
-            if output.strip():
-                events.append({
-                    "type": "tool_result",
-                    "tool": r["tool"],
-                    "result": {"output": output, "status": r["status"]},
-                    "phase": r["phase"],
-                    "timestamp": r["created_at"],
-                })
     return events
 
 
 @app.get("/api/engagements/{engagement_id}/tool-results")
 async def get_tool_results(engagement_id: str, user=Depends(get_current_user)):
     """Return all tool results for an engagement."""
-    engagement = await db.get_engagement(engagement_id)
-    if not engagement:
-        raise HTTPException(404, "Engagement not found")
+    await _require_engagement(engagement_id)
     return await db.get_tool_results(engagement_id)
 
 
@@ -634,7 +685,7 @@ async def export_full(engagement_id: str, user=Depends(get_current_user)):
         raise HTTPException(404, "Engagement not found")
     findings = await db.get_findings(engagement_id)
     tool_results = await db.get_tool_results(engagement_id)
-    return {
+    export_data = {
         "engagement": {
             "id": engagement["id"],
             "name": engagement["name"],
@@ -645,13 +696,20 @@ async def export_full(engagement_id: str, user=Depends(get_current_user)):
         "tool_results": tool_results,
         "exported_at": datetime.now(timezone.utc).isoformat(),
     }
+    # Tool output makes this payload large; encode it off the event loop
+    content = await asyncio.to_thread(orjson.dumps, export_data)
+    return Response(content=content, media_type="application/json")
+
+
+# Download filename sanitizing: drop unsafe characters, then collapse runs of
+# whitespace/underscores into a single underscore
+_FILENAME_UNSAFE_RE = re.compile(r'[^\w\s\-]')
+_FILENAME_SEP_RE = re.compile(r'[\s_]+')
 
 
 @app.get("/api/engagements/{engagement_id}/findings/export")
 async def export_findings(engagement_id: str, user=Depends(get_current_user)):
     """Export findings as downloadable JSON."""
-    from fastapi.responses import Response
-
     engagement = await db.get_engagement(engagement_id)
     if not engagement:
         raise HTTPException(404, "Engagement not found")
@@ -666,10 +724,11 @@ async def export_findings(engagement_id: str, user=Depends(get_current_user)):
         "findings": findings,
         "exported_at": datetime.now(timezone.utc).isoformat(),
     }
-    content = json.dumps(export_data, indent=2)
-    safe_name = re.sub(r'[^\w\s\-]', '', engagement["name"])
-    safe_name = re.sub(r'[\s]+', '_', safe_name)
-    safe_name = re.sub(r'_+', '_', safe_name).strip('_')[:60] or "engagement"
+    content = await asyncio.to_thread(
+        orjson.dumps, export_data, option=orjson.OPT_INDENT_2,
+    )
+    safe_name = _FILENAME_UNSAFE_RE.sub('', engagement["name"])
+    safe_name = _FILENAME_SEP_RE.sub('_', safe_name).strip('_')[:60] or "engagement"
 
     return Response(
         content=content,
@@ -690,9 +749,7 @@ async def send_message(
     req: MessageRequest,
     user=Depends(get_current_user),
 ):
-    engagement = await db.get_engagement(engagement_id)
-    if not engagement:
-        raise HTTPException(404, "Engagement not found")
+    await _require_engagement(engagement_id)
 
     # Save message to chat history
     await db.save_message(engagement_id, "user", req.message, username=user.username)
@@ -732,22 +789,20 @@ async def create_user(req: CreateUserRequest, admin=Depends(require_admin)):
 
 
 @app.get("/api/users")
-async def list_users(admin=Depends(require_admin)):
+async def list_users(
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    admin=Depends(require_admin),
+):
     user_mgr = _get_user_mgr()
-    users = await user_mgr.list_users()
+    users = await user_mgr.list_users(offset=offset, limit=limit)
     return [u.to_dict() for u in users]
 
 
 @app.put("/api/users/{username}")
 async def update_user(username: str, req: UpdateUserRequest, admin=Depends(require_admin)):
     user_mgr = _get_user_mgr()
-    user = await user_mgr.update_user(
-        username=username,
-        display_name=req.display_name,
-        email=req.email,
-        role=req.role,
-        enabled=req.enabled,
-    )
+    user = await user_mgr.update_user(username=username, **req.model_dump(exclude_unset=True))
     if not user:
         raise HTTPException(404, "User not found")
     return user.to_dict()
@@ -771,7 +826,8 @@ async def delete_user(username: str, admin=Depends(require_admin)):
 async def upload_firm_findings(file: UploadFile = File(...), admin=Depends(require_admin)):
     """Upload CSV to replace the firm finding library. Validates before writing."""
     data = await file.read()
-    rows, error = validate_csv(data)
+    # Parsing/validating a large CSV is CPU work; keep it off the event loop
+    rows, error = await asyncio.to_thread(validate_csv, data)
     if error:
         raise HTTPException(400, error)
     await db.replace_firm_findings(rows)
@@ -789,27 +845,35 @@ async def list_firm_findings(admin=Depends(require_admin)):
     return await db.get_firm_findings()
 
 
+def _docx_to_text(data: bytes) -> str:
+    doc = DocxDocument(_io.BytesIO(data))
+    return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+
+
 @app.post("/api/admin/firm-knowledge/report-template")
 async def upload_report_template(file: UploadFile = File(...), admin=Depends(require_admin)):
     """Upload .docx, extract plain text, store in config."""
     data = await file.read()
     try:
-        doc = DocxDocument(_io.BytesIO(data))
-        text = "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+        text = await asyncio.to_thread(_docx_to_text, data)
     except Exception as e:
         raise HTTPException(400, f"Failed to parse .docx: {e}")
     word_count = len(text.split())
-    await db.set_config("firm_report_template", text)
-    await db.set_config("firm_report_template_filename", file.filename)
-    await db.set_config("firm_report_template_updated_at", datetime.now(timezone.utc).isoformat())
+    await db.set_configs({
+        "firm_report_template": text,
+        "firm_report_template_filename": file.filename,
+        "firm_report_template_updated_at": datetime.now(timezone.utc).isoformat(),
+    })
     return {"word_count": word_count, "filename": file.filename}
 
 
 @app.delete("/api/admin/firm-knowledge/report-template")
 async def clear_report_template(admin=Depends(require_admin)):
-    await db.set_config("firm_report_template", "")
-    await db.set_config("firm_report_template_filename", "")
-    await db.set_config("firm_report_template_updated_at", "")
+    await db.set_configs({
+        "firm_report_template": "",
+        "firm_report_template_filename": "",
+        "firm_report_template_updated_at": "",
+    })
     return {"ok": True}
 
 
@@ -822,15 +886,19 @@ async def get_report_template(admin=Depends(require_admin)):
 @app.post("/api/admin/firm-knowledge/methodology")
 async def save_methodology(req: MethodologyRequest, admin=Depends(require_admin)):
     text = req.text
-    await db.set_config("firm_methodology", text)
-    await db.set_config("firm_methodology_updated_at", datetime.now(timezone.utc).isoformat())
+    await db.set_configs({
+        "firm_methodology": text,
+        "firm_methodology_updated_at": datetime.now(timezone.utc).isoformat(),
+    })
     return {"ok": True, "char_count": len(text)}
 
 
 @app.delete("/api/admin/firm-knowledge/methodology")
 async def clear_methodology(admin=Depends(require_admin)):
-    await db.set_config("firm_methodology", "")
-    await db.set_config("firm_methodology_updated_at", "")
+    await db.set_configs({
+        "firm_methodology": "",
+        "firm_methodology_updated_at": "",
+    })
     return {"ok": True}
 
 
@@ -843,11 +911,18 @@ async def get_methodology(admin=Depends(require_admin)):
 @app.get("/api/admin/firm-knowledge/status")
 async def get_firm_knowledge_status(admin=Depends(require_admin)):
     findings_status = await db.get_firm_findings_status()
-    methodology = await db.get_config("firm_methodology") or ""
-    methodology_updated_at = await db.get_config("firm_methodology_updated_at")
-    report_template = await db.get_config("firm_report_template") or ""
-    report_filename = await db.get_config("firm_report_template_filename") or ""
-    report_updated_at = await db.get_config("firm_report_template_updated_at")
+    cfg = await db.get_configs([
+        "firm_methodology",
+        "firm_methodology_updated_at",
+        "firm_report_template",
+        "firm_report_template_filename",
+        "firm_report_template_updated_at",
+    ])
+    methodology = cfg.get("firm_methodology") or ""
+    methodology_updated_at = cfg.get("firm_methodology_updated_at")
+    report_template = cfg.get("firm_report_template") or ""
+    report_filename = cfg.get("firm_report_template_filename") or ""
+    report_updated_at = cfg.get("firm_report_template_updated_at")
     feedback_count = await db.get_firm_feedback_count()
     return {
         "findings": {
@@ -927,15 +1002,25 @@ async def submit_finding_feedback(
 #  Health
 # ──────────────────────────────────────────────
 
+# Last toolbox probe, reused briefly so frequent health polling doesn't
+# turn into one toolbox request per poll
+_health_cache = {"ts": 0.0, "ok": False}
+_HEALTH_TTL = 2.0
+
+
 @app.get("/api/health")
 async def health():
-    toolbox_ok = False
-    try:
-        async with get_toolbox_client() as client:
-            resp = await client.get("/health", timeout=5.0)
+    now = time.monotonic()
+    if now - _health_cache["ts"] < _HEALTH_TTL:
+        toolbox_ok = _health_cache["ok"]
+    else:
+        toolbox_ok = False
+        try:
+            resp = await _get_toolbox().get("/health", timeout=5.0)
             toolbox_ok = resp.status_code == 200
-    except Exception:
-        pass
+        except Exception:
+            pass
+        _health_cache.update(ts=time.monotonic(), ok=toolbox_ok)
 
     return {
         "status": "ok",
@@ -959,7 +1044,7 @@ async def websocket_endpoint(
     username = "anonymous"
     if token:
         try:
-            payload = jwt.decode(token, settings.jwt_secret, algorithms=["HS256"])
+            payload = _decode_token(token)
             sub = payload.get("sub")
             if sub:
                 user_mgr = _get_user_mgr()
@@ -974,20 +1059,17 @@ async def websocket_endpoint(
         "username": username,
         "joined_at": datetime.now(timezone.utc).isoformat(),
     }
-    if engagement_id not in ws_presence:
-        ws_presence[engagement_id] = []
-    ws_presence[engagement_id].append(entry)
+    ws_presence.setdefault(engagement_id, {})[id(websocket)] = entry
     await broadcast_presence(engagement_id)
 
+    # Keepalive is handled by uvicorn's protocol-level ping/pong
+    # (--ws-ping-interval); inbound frames are drained and ignored.
     try:
-        while True:
-            data = await websocket.receive_text()
-            msg = json.loads(data)
-            if msg.get("type") == "ping":
-                await websocket.send_json({"type": "pong"})
-    except WebSocketDisconnect:
-        if engagement_id in ws_presence and entry in ws_presence[engagement_id]:
-            ws_presence[engagement_id].remove(entry)
+        async for _ in websocket.iter_text():
+            pass
+    finally:
+        if engagement_id in ws_presence:
+            ws_presence[engagement_id].pop(id(websocket), None)
         await broadcast_presence(engagement_id)
 
 
@@ -1016,12 +1098,16 @@ async def get_notification_config(admin=Depends(require_admin)):
 
 @app.post("/api/admin/notifications/config")
 async def save_notification_config(req: NotificationConfigRequest, admin=Depends(require_admin)):
+    values = {
+        "smtp_host": req.smtp_host,
+        "smtp_port": req.smtp_port or "587",
+        "smtp_username": req.smtp_username,
+        "smtp_from": req.smtp_from,
+    }
+    # Blank password means "keep the stored one"
     if req.smtp_password:
-        await db.set_config("smtp_password", req.smtp_password)
-    await db.set_config("smtp_host", req.smtp_host)
-    await db.set_config("smtp_port", req.smtp_port or "587")
-    await db.set_config("smtp_username", req.smtp_username)
-    await db.set_config("smtp_from", req.smtp_from)
+        values["smtp_password"] = req.smtp_password
+    await db.set_configs(values)
     return {"ok": True}
 
 
@@ -6,12 +6,20 @@ APScheduler jobs to start them at their scheduled_at time.
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.date import DateTrigger
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 scheduler = AsyncIOScheduler()
 
 
+def parse_scheduled_at(value: str) -> datetime:
+    """Parse a stored scheduled_at ISO string; naive values are taken as UTC."""
+    run_dt = datetime.fromisoformat(value)
+    if run_dt.tzinfo is None:
+        run_dt = run_dt.replace(tzinfo=timezone.utc)
+    return run_dt
+
+
 async def schedule_engagement(db, engagement_id: str, run_fn):
     """Register a scheduled engagement with APScheduler.
 
@@ -23,16 +31,21 @@ async def schedule_engagement(db, engagement_id: str, run_fn):
     eng = await db.get_engagement(engagement_id)
     if not eng or not eng.get("scheduled_at"):
         return
-    trigger = DateTrigger(run_date=datetime.fromisoformat(eng["scheduled_at"]))
-    scheduler.add_job(run_fn, trigger, args=[engagement_id], id=engagement_id, replace_existing=True)
+    _add_job(eng, run_fn)
+
+
+def _add_job(eng: dict, run_fn):
+    trigger = DateTrigger(run_date=parse_scheduled_at(eng["scheduled_at"]))
+    scheduler.add_job(run_fn, trigger, args=[eng["id"]], id=eng["id"], replace_existing=True)
 
 
 async def restore_schedules(db, run_fn):
     """On startup, re-register all scheduled engagements."""
     engagements = await db.list_engagements()
+    # The listed rows already carry scheduled_at; no need to re-fetch each one
     for eng in engagements:
         if eng["status"] == "scheduled" and eng.get("scheduled_at"):
-            await schedule_engagement(db, eng["id"], run_fn)
+            _add_job(eng, run_fn)
 
 
 def cancel_schedule(engagement_id: str):
@@ -308,6 +308,19 @@ class TestAgentInit(unittest.TestCase):
         self.assertIsInstance(agent._token_store, dict)
         self.assertEqual(len(agent._token_store), 0)
 
+    def test_init_reuses_injected_bedrock_client(self):
+        shared = MagicMock()
+        with patch("agent.BedrockClient") as mock_cls:
+            agent = PentestAgent(
+                db=MagicMock(),
+                engagement_id="test-123",
+                toolbox_url="http://toolbox:9500",
+                broadcast_fn=AsyncMock(),
+                bedrock=shared,
+            )
+        self.assertIs(agent.bedrock, shared)
+        mock_cls.assert_not_called()
+
     def test_get_tools_schema_returns_5_tools(self):
         agent = self._make_agent()
         tools = agent._get_tools_schema()
@@ -369,6 +382,12 @@ class TestTokenization(unittest.TestCase):
         self.assertNotIn("S3cret!", result)
         self.assertIn("[[_CRED_", result)
 
+    def test_tokenize_plain_text_unchanged(self):
+        agent = self._make_agent()
+        text = "Scan example.com and check the web server version"
+        self.assertEqual(agent.tokenize_input(text), text)
+        self.assertEqual(agent._token_store, {})
+
     def test_detokenize_roundtrip(self):
         agent = self._make_agent()
         original = "password=S3cret!"
@@ -405,6 +424,12 @@ class TestTokenization(unittest.TestCase):
         self.assertEqual(result[0], "real_value")
         self.assertEqual(result[1], "plain")
 
+    def test_detokenize_unknown_token_left_as_is(self):
+        agent = self._make_agent()
+        agent._token_store["[[_CRED_1_]]"] = "real_value"
+        result = agent.detokenize("a=[[_CRED_1_]] b=[[_CRED_2_]]")
+        self.assertEqual(result, "a=real_value b=[[_CRED_2_]]")
+
     def test_detokenize_obj_non_string(self):
         agent = self._make_agent()
         self.assertEqual(agent.detokenize_obj(42), 42)
@@ -708,6 +733,25 @@ class TestAgentFailureLearningWiring(unittest.IsolatedAsyncioTestCase):
         self.assertNotIn("⚠️ SYNTAX ERROR", result)
         agent.db.save_tool_lesson.assert_not_called()
 
+    async def test_injected_toolbox_client_is_reused(self):
+        """A shared toolbox client is used directly; no per-call client is built or closed."""
+        agent = self._make_agent()
+        agent.db.save_tool_start = AsyncMock(return_value=1)
+        agent.db.update_tool_result = AsyncMock()
+        mock_resp = MagicMock()
+        mock_resp.json = MagicMock(return_value={"status": "success", "output": "ok", "error": ""})
+        shared = AsyncMock()
+        shared.post = AsyncMock(return_value=mock_resp)
+        agent.toolbox = shared
+        with patch("agent.httpx.AsyncClient") as mock_cls:
+            await agent._execute_tool_call(
+                "execute_bash", {"command": "echo ok"}, target_scope=[]
+            )
+        mock_cls.assert_not_called()
+        shared.post.assert_awaited_once()
+        shared.aclose.assert_not_called()
+        shared.__aexit__.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,8 @@
 import asyncio
 import os
 import tempfile
+from unittest.mock import patch
+
 import pytest
 from db import Database
 
@@ -52,6 +54,11 @@ class TestEngagements:
         result = run(db.get_engagement("nonexistent"))
         assert result is None
 
+    def test_engagement_exists(self, db):
+        eng = run(db.create_engagement(name="Test", target_scope=["example.com"]))
+        assert run(db.engagement_exists(eng["id"])) is True
+        assert run(db.engagement_exists("nonexistent")) is False
+
     def test_list_engagements(self, db):
         run(db.create_engagement(name="Eng1", target_scope=[]))
         run(db.create_engagement(name="Eng2", target_scope=[]))
@@ -219,6 +226,16 @@ class TestFindings:
         findings = run(db.get_findings(eng["id"]))
         assert len(findings) == 2
 
+    def test_get_finding_counts(self, db):
+        eng1 = run(db.create_engagement(name="One", target_scope=[]))
+        eng2 = run(db.create_engagement(name="Two", target_scope=[]))
+        run(db.create_engagement(name="Empty", target_scope=[]))
+        run(db.save_finding(eng1["id"], {"severity": "high", "title": "SQLi", "phase": "VULN_SCAN"}))
+        run(db.save_finding(eng1["id"], {"severity": "low", "title": "Info", "phase": "RECON"}))
+        run(db.save_finding(eng2["id"], {"severity": "medium", "title": "XSS", "phase": "VULN_SCAN"}))
+        counts = run(db.get_finding_counts())
+        assert counts == {eng1["id"]: 2, eng2["id"]: 1}
+
     def test_update_finding_exploitation_status(self, db):
         eng = run(db.create_engagement(name="Test", target_scope=[]))
         finding = run(db.save_finding(eng["id"], {
@@ -318,6 +335,19 @@ class TestUsers:
         assert "alice" in usernames
         assert "bob" in usernames
 
+    def test_list_users_paginated(self, db):
+        for name in ("alice", "bob", "carol"):
+            run(db.save_user({"username": name, "password_hash": "h", "role": "operator"}))
+        page = run(db.list_users(offset=1, limit=1))
+        assert [u["username"] for u in page] == ["bob"]
+        rest = run(db.list_users(offset=1))
+        assert [u["username"] for u in rest] == ["bob", "carol"]
+
+    def test_list_users_include_hash(self, db):
+        run(db.save_user({"username": "alice", "password_hash": "h1", "role": "operator"}))
+        assert "password_hash" not in run(db.list_users())[0]
+        assert run(db.list_users(include_hash=True))[0]["password_hash"] == "h1"
+
     def test_delete_user(self, db):
         run(db.save_user({"username": "todelete", "password_hash": "h1", "role": "operator"}))
         assert run(db.get_user("todelete")) is not None
@@ -356,6 +386,21 @@ class TestUsers:
         assert users == []
 
 
+class TestSchema:
+    def test_engagement_indexes_exist(self, db):
+        async def index_names():
+            async with db._db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            ) as cursor:
+                return {r["name"] for r in await cursor.fetchall()}
+        names = run(index_names())
+        assert {
+            "idx_tool_results_engagement",
+            "idx_findings_engagement",
+            "idx_chat_history_engagement",
+        } <= names
+
+
 class TestConfig:
     def test_set_and_get_config(self, db):
         run(db.set_config("branding_name", "My Pentest App"))
@@ -377,6 +422,40 @@ class TestConfig:
         val = run(db.get_config("settings"))
         assert val == {"a": 1, "b": [2, 3]}
 
+    def test_config_big_int_roundtrips_exactly(self, db):
+        value = {"big": 2**70 + 1, "neg": -(2**63) - 1, "small": 7}
+        run(db.set_config("ids", value))
+        db._config_cache.clear()
+        assert run(db.get_config("ids")) == value
+
+    def test_get_configs_batch(self, db):
+        run(db.set_config("a", "1"))
+        run(db.set_config("b", {"x": 2}))
+        vals = run(db.get_configs(["a", "b", "missing"]))
+        assert vals == {"a": "1", "b": {"x": 2}}
+        assert run(db.get_configs([])) == {}
+
+    def test_set_configs_batch(self, db):
+        run(db.set_config("a", "old"))
+        run(db.set_configs({"a": "new", "b": [1, 2]}))
+        assert run(db.get_configs(["a", "b"])) == {"a": "new", "b": [1, 2]}
+
+    def test_config_cache_serves_reads_and_tracks_writes(self, db):
+        run(db.set_config("theme", "dark"))
+        # Cached reads don't touch the database
+        with patch.object(db._db, "execute", wraps=db._db.execute) as execute:
+            assert run(db.get_config("theme")) == "dark"
+            assert run(db.get_configs(["theme"])) == {"theme": "dark"}
+            assert execute.call_count == 0
+            run(db.get_config("missing"))
+            run(db.get_config("missing"))
+            assert execute.call_count == 1
+
+    def test_config_cache_returns_fresh_copies(self, db):
+        run(db.set_config("settings", {"a": [1]}))
+        run(db.get_config("settings"))["a"].append(2)
+        assert run(db.get_config("settings")) == {"a": [1]}
+
 
 class TestToolLessons:
     def test_save_and_retrieve_lesson(self, db):
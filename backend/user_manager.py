@@ -4,6 +4,7 @@ Handles user accounts, authentication, roles.
 Persists to SQLite via the Database layer.
 """
 
+import asyncio
 import secrets
 import sys
 from datetime import datetime, timezone
@@ -37,6 +38,12 @@ def validate_password(password: str) -> None:
 class User:
     """In-memory user representation."""
 
+    # A User is built for every authenticated request; slots keep it small
+    __slots__ = (
+        "username", "password_hash", "role", "display_name",
+        "email", "enabled", "must_change_password",
+    )
+
     def __init__(
         self,
         username: str,
@@ -97,6 +104,21 @@ class User:
 class UserManager:
     def __init__(self, db: Database):
         self.db = db
+        # Raw user rows by username; every request's auth looks the user up,
+        # and all writes go through this class, which invalidates on change
+        self._user_cache: dict[str, dict] = {}
+
+    async def _fetch(self, username: str) -> Optional[dict]:
+        data = self._user_cache.get(username)
+        if data is None:
+            data = await self.db.get_user(username)
+            if data:
+                self._user_cache[username] = data
+        return data
+
+    async def _save(self, user: User):
+        await self.db.save_user(user.to_db_dict())
+        self._user_cache.pop(user.username, None)
 
     async def ensure_admin(self):
         """Create default admin if no users exist. Call once after db.initialize()."""
@@ -111,7 +133,7 @@ class UserManager:
             display_name="Administrator",
             must_change_password=True,
         )
-        await self.db.save_user(admin.to_db_dict())
+        await self._save(admin)
         msg = (
             "\n"
             "==================================================\n"
@@ -127,11 +149,12 @@ class UserManager:
     async def authenticate(self, username_raw: str, password: str) -> Optional[User]:
         """Authenticate and return user, or None."""
         username = username_raw.lower()
-        data = await self.db.get_user(username)
+        data = await self._fetch(username)
         if not data:
             return None
         user = User.from_db(data)
-        if user.enabled and user.verify_password(password):
+        # bcrypt is deliberately slow; keep it off the event loop
+        if user.enabled and await asyncio.to_thread(user.verify_password, password):
             return user
         return None
 
@@ -149,12 +172,12 @@ class UserManager:
 
         user = User(
             username=username,
-            password_hash=pwd_context.hash(password),
+            password_hash=await asyncio.to_thread(pwd_context.hash, password),
             role=role,
             display_name=display_name,
             email=email,
         )
-        await self.db.save_user(user.to_db_dict())
+        await self._save(user)
         return user
 
     async def update_user(
@@ -162,7 +185,7 @@ class UserManager:
         email: str = None, role: str = None, enabled: bool = None,
     ) -> Optional[User]:
         username = username.lower()
-        data = await self.db.get_user(username)
+        data = await self._fetch(username)
         if not data:
             return None
         user = User.from_db(data)
@@ -174,19 +197,19 @@ class UserManager:
             user.role = role
         if enabled is not None:
             user.enabled = enabled
-        await self.db.save_user(user.to_db_dict())
+        await self._save(user)
         return user
 
     async def change_password(self, username: str, new_password: str) -> bool:
         validate_password(new_password)
         username = username.lower()
-        data = await self.db.get_user(username)
+        data = await self._fetch(username)
         if not data:
             return False
         user = User.from_db(data)
-        user.password_hash = pwd_context.hash(new_password)
+        user.password_hash = await asyncio.to_thread(pwd_context.hash, new_password)
         user.must_change_password = False
-        await self.db.save_user(user.to_db_dict())
+        await self._save(user)
         return True
 
     async def delete_user(self, username: str) -> bool:
@@ -195,20 +218,15 @@ class UserManager:
         if not existing:
             return False
         await self.db.delete_user(username)
+        self._user_cache.pop(username, None)
         return True
 
     async def get_user(self, username: str) -> Optional[User]:
-        data = await self.db.get_user(username.lower())
+        data = await self._fetch(username.lower())
         if not data:
             return None
         return User.from_db(data)
 
-    async def list_users(self) -> list[User]:
-        rows = await self.db.list_users()
-        # list_users from db doesn't include password_hash, so fetch full records
-        users = []
-        for row in rows:
-            data = await self.db.get_user(row["username"])
-            if data:
-                users.append(User.from_db(data))
-        return users
+    async def list_users(self, offset: int = 0, limit: Optional[int] = None) -> list[User]:
+        rows = await self.db.list_users(offset=offset, limit=limit, include_hash=True)
+        return [User.from_db(row) for row in rows]
@@ -1,4 +1,4 @@
-export function connectWS(engagementId, onEvent) {
+export function connectWS(engagementId, onEvent, attempt = 0) {
   const token = localStorage.getItem("token");
   const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
   const host = import.meta.env.VITE_API_URL
@@ -7,11 +7,18 @@ export function connectWS(engagementId, onEvent) {
   const url = `${protocol}//${host}/ws/${engagementId}?token=${token}`;
 
   const ws = new WebSocket(url);
+  ws.onopen = () => {
+    attempt = 0;
+  };
   ws.onmessage = (e) => {
     try { onEvent(JSON.parse(e.data)); } catch {}
   };
   ws.onclose = () => {
-    setTimeout(() => connectWS(engagementId, onEvent), 3000);
+    // Reconnect with exponential backoff (0.5s doubling, capped at 30s) plus
+    // jitter so clients don't all reconnect at once after a server restart
+    const base = Math.min(500 * 2 ** attempt, 30000);
+    const delay = base / 2 + Math.random() * (base / 2);
+    setTimeout(() => connectWS(engagementId, onEvent, attempt + 1), delay);
   };
   return ws;
 }
@@ -8,11 +8,12 @@ The backend service communicates with this server to execute tools.
 import asyncio
 import json
 import os
+import secrets
 import shlex
 import signal
+import stat
 import subprocess
 import time
-import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -36,12 +37,32 @@ app.add_middleware(
 TOOLS_FILE = "/opt/pentest/configs/tool_definitions.yaml"
 DATA_DIR = "/opt/pentest/data"
 
+# Prefer the libyaml C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 with open(TOOLS_FILE) as f:
-    TOOL_DEFS = yaml.safe_load(f)["tools"]
+    TOOL_DEFS = yaml.load(f, Loader=_YamlLoader)["tools"]
 
 # Track running processes
 running_tasks = {}
 
+# One-shot change events per task; set (and replaced) whenever a task's
+# output or status changes so streamers wake immediately instead of polling
+task_events: dict[str, asyncio.Event] = {}
+
+
+def _task_event(task_id: str) -> asyncio.Event:
+    return task_events.setdefault(task_id, asyncio.Event())
+
+
+def _notify_task(task_id: str):
+    event = task_events.pop(task_id, None)
+    if event:
+        event.set()
+
 
 class ToolRequest(BaseModel):
     tool: str
@@ -243,6 +264,7 @@ async def run_tool_async(task_id: str, cmd: list, stdin_data: str = None,
                 if not line:
                     break
                 task[key] += line.decode(errors="replace")
+                _notify_task(task_id)
 
         try:
             await asyncio.wait_for(
@@ -258,6 +280,7 @@ async def run_tool_async(task_id: str, cmd: list, stdin_data: str = None,
             await process.wait()
             task["status"] = "timeout"
             task["error"] += f"\nTask timed out after {timeout}s"
+            _notify_task(task_id)
             return
 
         task["return_code"] = process.returncode
@@ -268,9 +291,9 @@ async def run_tool_async(task_id: str, cmd: list, stdin_data: str = None,
             task_path = Path(cwd)
             try:
                 if task["output"].strip():
-                    (task_path / "output.txt").write_text(task["output"])
+                    await asyncio.to_thread((task_path / "output.txt").write_text, task["output"])
                 if task["error"].strip():
-                    (task_path / "stderr.txt").write_text(task["error"])
+                    await asyncio.to_thread((task_path / "stderr.txt").write_text, task["error"])
             except Exception:
                 pass
 
@@ -279,6 +302,7 @@ async def run_tool_async(task_id: str, cmd: list, stdin_data: str = None,
         task["error"] = str(e)
 
     task["finished_at"] = datetime.utcnow().isoformat()
+    _notify_task(task_id)
 
 
 @app.get("/health")
@@ -313,7 +337,7 @@ async def execute_tool(request: ToolRequest):
     if request.tool not in TOOL_DEFS:
         raise HTTPException(status_code=404, detail=f"Unknown tool: {request.tool}")
     
-    task_id = request.task_id or str(uuid.uuid4())[:8]
+    task_id = request.task_id or secrets.token_hex(4)
     tool_def = TOOL_DEFS[request.tool]
     
     # Create output directory for this task
@@ -364,7 +388,7 @@ async def execute_tool_sync(request: ToolRequest):
     if request.tool not in TOOL_DEFS:
         raise HTTPException(status_code=404, detail=f"Unknown tool: {request.tool}")
     
-    task_id = request.task_id or str(uuid.uuid4())[:8]
+    task_id = request.task_id or secrets.token_hex(4)
     tool_def = TOOL_DEFS[request.tool]
     
     task_dir = Path(DATA_DIR) / task_id
@@ -426,6 +450,7 @@ async def kill_task(task_id: str):
         try:
             os.kill(task["pid"], signal.SIGTERM)
             task["status"] = "killed"
+            _notify_task(task_id)
             return {"status": "killed", "task_id": task_id}
         except ProcessLookupError:
             return {"status": "already_finished", "task_id": task_id}
@@ -446,7 +471,8 @@ async def read_file(path: str):
         from fastapi.responses import FileResponse
         return FileResponse(file_path, media_type=f"image/{file_path.suffix.lower().strip('.')}")
     
-    content = file_path.read_text(errors="replace")
+    # Scan output files can be large; read off the event loop
+    content = await asyncio.to_thread(file_path.read_text, errors="replace")
     return {"path": str(file_path), "content": content}
 
 
@@ -537,18 +563,26 @@ async def list_screenshots(directory: str = "", task_id: str = ""):
         if not search_dir.exists():
             continue
         for file_path in search_dir.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in image_exts:
-                try:
-                    rel_path = str(file_path.relative_to("/opt/pentest"))
-                except ValueError:
-                    rel_path = str(file_path)
-                screenshots.append({
-                    "name": file_path.name,
-                    "path": rel_path,
-                    "full_path": str(file_path),
-                    "size": file_path.stat().st_size,
-                    "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
-                })
+            # Check the suffix before touching the filesystem, then stat once
+            if file_path.suffix.lower() not in image_exts:
+                continue
+            try:
+                st = file_path.stat()
+            except OSError:  # broken symlink or file removed mid-walk
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            try:
+                rel_path = str(file_path.relative_to("/opt/pentest"))
+            except ValueError:
+                rel_path = str(file_path)
+            screenshots.append({
+                "name": file_path.name,
+                "path": rel_path,
+                "full_path": str(file_path),
+                "size": st.st_size,
+                "modified": datetime.fromtimestamp(st.st_mtime).isoformat(),
+            })
 
     return {"screenshots": screenshots}
 
@@ -581,8 +615,7 @@ async def get_workspace():
     IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".svg"}
     SKIP_NAMES = {"sessions"}
 
-    def file_entry(f: Path) -> dict:
-        stat = f.stat()
+    def file_entry(f: Path, st: os.stat_result) -> dict:
         try:
             rel = str(f.relative_to("/opt/pentest"))
         except ValueError:
@@ -590,8 +623,8 @@ async def get_workspace():
         return {
             "name": f.name,
             "path": rel,
-            "size": stat.st_size,
-            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            "size": st.st_size,
+            "modified": datetime.fromtimestamp(st.st_mtime).isoformat(),
             "is_image": f.suffix.lower() in IMAGE_EXTS,
         }
 
@@ -601,21 +634,32 @@ async def get_workspace():
     if not data_dir.exists():
         return {"task_dirs": [], "loose_files": []}
 
-    for item in sorted(data_dir.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True):
+    # Stat every entry exactly once and reuse the result for sorting,
+    # type checks and the response fields
+    items = [(item, item.stat()) for item in data_dir.iterdir()]
+    items.sort(key=lambda e: e[1].st_mtime, reverse=True)
+    for item, item_st in items:
         if item.name in SKIP_NAMES:
             continue
-        if item.is_file():
-            loose_files.append(file_entry(item))
-        elif item.is_dir():
+        if stat.S_ISREG(item_st.st_mode):
+            loose_files.append(file_entry(item, item_st))
+        elif stat.S_ISDIR(item_st.st_mode):
             files = []
             total_size = 0
             latest_mtime = 0.0
-            for f in sorted(item.rglob("*"), key=lambda p: p.stat().st_mtime if p.is_file() else 0):
-                if f.is_file():
-                    stat = f.stat()
-                    files.append(file_entry(f))
-                    total_size += stat.st_size
-                    latest_mtime = max(latest_mtime, stat.st_mtime)
+            regular = []
+            for f in item.rglob("*"):
+                try:
+                    st = f.stat()
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    regular.append((f, st))
+            regular.sort(key=lambda e: e[1].st_mtime)
+            for f, st in regular:
+                files.append(file_entry(f, st))
+                total_size += st.st_size
+                latest_mtime = max(latest_mtime, st.st_mtime)
             if files:
                 task_dirs.append({
                     "name": item.name,
@@ -643,6 +687,8 @@ async def ws_task_stream(websocket: WebSocket, task_id: str):
                 break
             
             task = running_tasks[task_id]
+            # Grab the event before reading state so no update is missed
+            changed = _task_event(task_id)
             
             # Send new output
             if len(task["output"]) > last_output_len:
@@ -663,10 +709,21 @@ async def ws_task_stream(websocket: WebSocket, task_id: str):
                 })
                 break
             
-            await asyncio.sleep(0.5)
+            # Wake on the next output/status change; the timeout is only a
+            # safety net
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                pass
     
     except WebSocketDisconnect:
         pass
+    finally:
+        # A running task pops its event on the next notify; a finished or
+        # unknown one never notifies again, so drop it here
+        task = running_tasks.get(task_id)
+        if task is None or task["status"] in ("completed", "failed", "error", "timeout", "killed"):
+            task_events.pop(task_id, None)
 
 
 